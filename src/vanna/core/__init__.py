@@ -24,7 +24,10 @@ from .audit import (
     AuditLogger,
     AuditEvent,
     AuditEventType,
+    SanitizeMode,
     ToolAccessCheckEvent,
+    ToolEvent,
+    ToolEventPhase,
     ToolInvocationEvent,
     ToolResultEvent,
     UiFeatureAccessCheckEvent,
@@ -134,7 +137,10 @@ __all__ = [
     # Audit
     "AuditEvent",
     "AuditEventType",
+    "SanitizeMode",
     "ToolAccessCheckEvent",
+    "ToolEvent",
+    "ToolEventPhase",
     "ToolInvocationEvent",
     "ToolResultEvent",
     "UiFeatureAccessCheckEvent",
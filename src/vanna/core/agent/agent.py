@@ -782,7 +782,7 @@ class Agent:
                         )
 
                     # Run before_tool hooks with observability
-                    tool = await self.tool_registry.get_tool(tool_call.name)
+                    tool = self.tool_registry.get_tool(tool_call.name)
                     if tool:
                         for hook in self.lifecycle_hooks:
                             hook_span = None
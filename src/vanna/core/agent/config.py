@@ -4,11 +4,12 @@ Agent configuration.
 This module contains configuration models that control agent behavior.
 """
 
-from typing import TYPE_CHECKING, Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, SecretStr, model_validator
 
 from .._compat import StrEnum
+from ..audit.models import SanitizeMode
 
 if TYPE_CHECKING:
     from ..user import User
@@ -105,9 +106,30 @@ class AuditConfig(BaseModel):
         default=False,
         description="Include full AI response text in logs (privacy concern)",
     )
-    sanitize_tool_parameters: bool = Field(
-        default=True, description="Sanitize sensitive parameters (passwords, tokens)"
+    sanitize_tool_parameters: Union[bool, SanitizeMode] = Field(
+        default=True,
+        description=(
+            "Sanitize sensitive parameters (passwords, tokens). True redacts "
+            "them, False logs them as given; a SanitizeMode picks explicitly."
+        ),
     )
+    parameter_hash_key: Optional[SecretStr] = Field(
+        default=None,
+        description="Secret key for SanitizeMode.HASH digests (required for HASH)",
+    )
+
+    @model_validator(mode="after")
+    def validate_parameter_hash_key(self) -> "AuditConfig":
+        """Require a hash key when sensitive parameters are hashed."""
+        if (
+            self.sanitize_tool_parameters == SanitizeMode.HASH
+            and self.parameter_hash_key is None
+        ):
+            raise ValueError(
+                "parameter_hash_key is required when sanitize_tool_parameters "
+                "is SanitizeMode.HASH"
+            )
+        return self
 
 
 class AgentConfig(BaseModel):
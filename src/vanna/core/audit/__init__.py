@@ -10,7 +10,10 @@ from .models import (
     AiResponseEvent,
     AuditEvent,
     AuditEventType,
+    SanitizeMode,
     ToolAccessCheckEvent,
+    ToolEvent,
+    ToolEventPhase,
     ToolInvocationEvent,
     ToolResultEvent,
     UiFeatureAccessCheckEvent,
@@ -20,7 +23,10 @@ __all__ = [
     "AuditLogger",
     "AuditEvent",
     "AuditEventType",
+    "SanitizeMode",
     "ToolAccessCheckEvent",
+    "ToolEvent",
+    "ToolEventPhase",
     "ToolInvocationEvent",
     "ToolResultEvent",
     "UiFeatureAccessCheckEvent",
@@ -5,15 +5,32 @@ Audit loggers enable tracking user actions, tool invocations, and access control
 decisions for security, compliance, and debugging.
 """
 
+import functools
 import hashlib
+import hmac
+import inspect
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Sequence,
+    Union,
+    cast,
+)
 
 from .models import (
     AiResponseEvent,
     AuditEvent,
+    SanitizeMode,
     ToolAccessCheckEvent,
+    ToolEvent,
+    ToolEventPhase,
     ToolInvocationEvent,
     ToolResultEvent,
     UiFeatureAccessCheckEvent,
@@ -24,6 +41,38 @@ if TYPE_CHECKING:
     from ..user.models import User
 
 
+@functools.lru_cache(maxsize=128)
+def _accepted_kwargs(func: Callable[..., Any]) -> Optional[FrozenSet[str]]:
+    """Names of the arguments func accepts, or None if it takes **kwargs."""
+    params = inspect.signature(func).parameters.values()
+    if any(param.kind is param.VAR_KEYWORD for param in params):
+        return None
+    return frozenset(param.name for param in params)
+
+
+def _optional_kwargs(method: Callable[..., Any], **kwargs: Any) -> Dict[str, Any]:
+    """Select the optional arguments that are set and that method accepts.
+
+    Subclasses may override the convenience methods with the signatures
+    they had before these arguments were added.
+    """
+    accepted = _accepted_kwargs(getattr(method, "__func__", method))
+    return {
+        name: value
+        for name, value in kwargs.items()
+        if value is not None and (accepted is None or name in accepted)
+    }
+
+
+def _sanitize_mode(sanitize_parameters: Union[bool, SanitizeMode]) -> SanitizeMode:
+    """Map the sanitize_parameters setting to a SanitizeMode."""
+    if sanitize_parameters is True:
+        return SanitizeMode.REDACT
+    if sanitize_parameters is False:
+        return SanitizeMode.NONE
+    return SanitizeMode(sanitize_parameters)
+
+
 class AuditLogger(ABC):
     """Abstract base class for audit logging implementations.
 
@@ -59,6 +108,170 @@ class AuditLogger(ABC):
         """
         pass
 
+    async def log_batch(self, events: List[ToolEvent]) -> None:
+        """Write a batch of queued tool events.
+
+        The default implementation passes each event, in order, to
+        log_tool_event(). Implementations backed by a database or remote
+        service can override this to write the batch in one request.
+
+        If the audit writer is cancelled mid-batch, it passes the batch again
+        before stopping. log_tool_event() skips the records an event has
+        already written (event.records_written); overrides should do the
+        same or write batches atomically.
+
+        Args:
+            events: Queued tool events, oldest first
+        """
+        for event in events:
+            await self.log_tool_event(event)
+
+    async def log_tool_event(self, event: ToolEvent) -> None:
+        """Log one phase of a tool execution.
+
+        Emits the access check, invocation and result audit events enabled
+        by the event's audit config, skipping those already written for the
+        event (see log_batch()). Optional arguments added to the
+        convenience methods after their first release (timestamp, hash_key,
+        execution_time_ms) are only passed to overrides that accept them.
+
+        Args:
+            event: The tool event to log
+        """
+        config = event.audit_config
+        if event.phase == ToolEventPhase.START:
+            if event.records_written < 1:
+                if config.log_tool_access_checks:
+                    await self._log_tool_access_check_event(event)
+                event.records_written = 1
+            if event.records_written < 2:
+                if event.access_granted and config.log_tool_invocations:
+                    await self._log_tool_invocation_event(event)
+                event.records_written = 2
+        elif event.records_written < 1:
+            if event.result is not None and config.log_tool_results:
+                await self._log_tool_result_event(event)
+            event.records_written = 1
+
+    async def _log_tool_access_check_event(self, event: ToolEvent) -> None:
+        """Log the access check of a START tool event."""
+        if type(self).log_tool_access_check is not AuditLogger.log_tool_access_check:
+            await self.log_tool_access_check(
+                user=event.context.user,
+                tool_name=event.tool_name,
+                access_granted=event.access_granted,
+                required_groups=list(event.required_groups),
+                context=event.context,
+                reason=event.reason,
+                **_optional_kwargs(
+                    self.log_tool_access_check, timestamp=event.timestamp
+                ),
+            )
+            return
+
+        await self.log_event(
+            ToolAccessCheckEvent(
+                timestamp=event.timestamp,
+                user_id=event.user_id,
+                username=event.username,
+                user_email=event.user_email,
+                user_groups=list(event.user_groups),
+                conversation_id=event.conversation_id,
+                request_id=event.request_id,
+                tool_name=event.tool_name,
+                access_granted=event.access_granted,
+                required_groups=list(event.required_groups),
+                reason=event.reason,
+            )
+        )
+
+    async def _log_tool_invocation_event(self, event: ToolEvent) -> None:
+        """Log the invocation of a permitted START tool event."""
+        config = event.audit_config
+        hash_key = (
+            config.parameter_hash_key.get_secret_value()
+            if config.parameter_hash_key is not None
+            else None
+        )
+        if type(self).log_tool_invocation is not AuditLogger.log_tool_invocation:
+            await self.log_tool_invocation(
+                user=event.context.user,
+                tool_call=event.tool_call,
+                ui_features=list(event.ui_features),
+                context=event.context,
+                sanitize_parameters=config.sanitize_tool_parameters,
+                **_optional_kwargs(
+                    self.log_tool_invocation,
+                    hash_key=hash_key,
+                    timestamp=event.timestamp,
+                ),
+            )
+            return
+
+        parameters = event.arguments
+        sanitized = False
+        mode = _sanitize_mode(config.sanitize_tool_parameters)
+        if mode != SanitizeMode.NONE:
+            parameters, sanitized = self._sanitize_parameters(
+                parameters, mode, hash_key
+            )
+
+        await self.log_event(
+            ToolInvocationEvent(
+                timestamp=event.timestamp,
+                user_id=event.user_id,
+                username=event.username,
+                user_email=event.user_email,
+                user_groups=list(event.user_groups),
+                conversation_id=event.conversation_id,
+                request_id=event.request_id,
+                tool_call_id=event.tool_call_id,
+                tool_name=event.tool_name,
+                parameters=parameters,
+                parameters_sanitized=sanitized,
+                ui_features_available=list(event.ui_features),
+            )
+        )
+
+    async def _log_tool_result_event(self, event: ToolEvent) -> None:
+        """Log the result of an END tool event."""
+        if type(self).log_tool_result is not AuditLogger.log_tool_result:
+            await self.log_tool_result(
+                user=event.context.user,
+                tool_call=event.tool_call,
+                result=cast("ToolResult", event.result),
+                context=event.context,
+                **_optional_kwargs(
+                    self.log_tool_result,
+                    execution_time_ms=event.duration_ms,
+                    timestamp=event.timestamp,
+                ),
+            )
+            return
+
+        await self.log_event(
+            ToolResultEvent(
+                timestamp=event.timestamp,
+                user_id=event.user_id,
+                username=event.username,
+                user_email=event.user_email,
+                user_groups=list(event.user_groups),
+                conversation_id=event.conversation_id,
+                request_id=event.request_id,
+                tool_call_id=event.tool_call_id,
+                tool_name=event.tool_name,
+                success=event.success,
+                error=event.error,
+                execution_time_ms=event.duration_ms or 0.0,
+                result_size_bytes=(
+                    len(event.result_for_llm.encode("utf-8"))
+                    if event.result_for_llm
+                    else 0
+                ),
+                ui_component_type=event.ui_component_type,
+            )
+        )
+
     async def log_tool_access_check(
         self,
         user: "User",
@@ -67,6 +280,7 @@ class AuditLogger(ABC):
         required_groups: List[str],
         context: "ToolContext",
         reason: Optional[str] = None,
+        timestamp: Optional[datetime] = None,
     ) -> None:
         """Convenience method for logging tool access checks.
 
@@ -77,8 +291,10 @@ class AuditLogger(ABC):
             required_groups: Groups required to access the tool
             context: Tool execution context
             reason: Optional reason for denial
+            timestamp: When the check happened; defaults to now
         """
         event = ToolAccessCheckEvent(
+            timestamp=timestamp or datetime.utcnow(),
             user_id=user.id,
             username=user.username,
             user_email=user.email,
@@ -96,9 +312,11 @@ class AuditLogger(ABC):
         self,
         user: "User",
         tool_call: "ToolCall",
-        ui_features: List[str],
+        ui_features: Sequence[str],
         context: "ToolContext",
-        sanitize_parameters: bool = True,
+        sanitize_parameters: Union[bool, SanitizeMode] = True,
+        hash_key: Optional[str] = None,
+        timestamp: Optional[datetime] = None,
     ) -> None:
         """Convenience method for logging tool invocations.
 
@@ -107,15 +325,24 @@ class AuditLogger(ABC):
             tool_call: Tool call information
             ui_features: List of UI features available to the user
             context: Tool execution context
-            sanitize_parameters: Whether to sanitize sensitive parameters
+            sanitize_parameters: How to sanitize sensitive parameters. True
+                means SanitizeMode.REDACT and False means SanitizeMode.NONE.
+            hash_key: Secret key for SanitizeMode.HASH digests
+            timestamp: When the tool was invoked; defaults to now
         """
-        parameters = tool_call.arguments.copy()
+        mode = _sanitize_mode(sanitize_parameters)
+
+        # Arguments are passed by reference; only sanitization copies them
+        parameters = tool_call.arguments
         sanitized = False
 
-        if sanitize_parameters:
-            parameters, sanitized = self._sanitize_parameters(parameters)
+        if mode != SanitizeMode.NONE:
+            parameters, sanitized = self._sanitize_parameters(
+                parameters, mode, hash_key
+            )
 
         event = ToolInvocationEvent(
+            timestamp=timestamp or datetime.utcnow(),
             user_id=user.id,
             username=user.username,
             user_email=user.email,
@@ -126,7 +353,7 @@ class AuditLogger(ABC):
             tool_name=tool_call.name,
             parameters=parameters,
             parameters_sanitized=sanitized,
-            ui_features_available=ui_features,
+            ui_features_available=list(ui_features),
         )
         await self.log_event(event)
 
@@ -136,6 +363,8 @@ class AuditLogger(ABC):
         tool_call: "ToolCall",
         result: "ToolResult",
         context: "ToolContext",
+        execution_time_ms: Optional[float] = None,
+        timestamp: Optional[datetime] = None,
     ) -> None:
         """Convenience method for logging tool results.
 
@@ -144,8 +373,15 @@ class AuditLogger(ABC):
             tool_call: Tool call information
             result: Tool execution result
             context: Tool execution context
+            execution_time_ms: Measured execution time; defaults to the
+                execution_time_ms recorded in the result metadata
+            timestamp: When the tool finished; defaults to now
         """
+        if execution_time_ms is None:
+            execution_time_ms = result.metadata.get("execution_time_ms", 0.0)
+
         event = ToolResultEvent(
+            timestamp=timestamp or datetime.utcnow(),
             user_id=user.id,
             username=user.username,
             user_email=user.email,
@@ -156,7 +392,7 @@ class AuditLogger(ABC):
             tool_name=tool_call.name,
             success=result.success,
             error=result.error,
-            execution_time_ms=result.metadata.get("execution_time_ms", 0.0),
+            execution_time_ms=execution_time_ms,
             result_size_bytes=(
                 len(result.result_for_llm.encode("utf-8"))
                 if result.result_for_llm
@@ -264,18 +500,26 @@ class AuditLogger(ABC):
         raise NotImplementedError("Query not supported by this implementation")
 
     def _sanitize_parameters(
-        self, parameters: Dict[str, Any]
+        self,
+        parameters: Dict[str, Any],
+        mode: SanitizeMode = SanitizeMode.REDACT,
+        hash_key: Optional[str] = None,
     ) -> tuple[Dict[str, Any], bool]:
         """Sanitize sensitive data from parameters.
 
+        The parameters are only copied when a sensitive field is found.
+        Hashing uses HMAC-SHA256 so digests of guessable secrets cannot be
+        reversed without the key; without a key, values are redacted.
+
         Args:
             parameters: Raw parameters dict
+            mode: Whether to redact or hash sensitive values
+            hash_key: Secret key for SanitizeMode.HASH digests
 
         Returns:
             Tuple of (sanitized_parameters, was_sanitized)
         """
-        sanitized = parameters.copy()
-        was_sanitized = False
+        sanitized: Optional[Dict[str, Any]] = None
 
         # Common sensitive field patterns
         sensitive_patterns = [
@@ -290,10 +534,21 @@ class AuditLogger(ABC):
             "access_key",
         ]
 
-        for key in list(sanitized.keys()):
+        for key, value in parameters.items():
             key_lower = key.lower()
             if any(pattern in key_lower for pattern in sensitive_patterns):
-                sanitized[key] = "[REDACTED]"
-                was_sanitized = True
-
-        return sanitized, was_sanitized
+                if sanitized is None:
+                    sanitized = dict(parameters)
+                if mode == SanitizeMode.HASH and hash_key:
+                    digest = hmac.new(
+                        hash_key.encode("utf-8"),
+                        str(value).encode("utf-8"),
+                        hashlib.sha256,
+                    ).hexdigest()
+                    sanitized[key] = f"hmac-sha256:{digest}"
+                else:
+                    sanitized[key] = "[REDACTED]"
+
+        if sanitized is None:
+            return parameters, False
+        return sanitized, True
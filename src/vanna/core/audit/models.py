@@ -5,13 +5,18 @@ This module contains data models for audit logging events.
 """
 
 import uuid
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
 
 from pydantic import BaseModel, Field
 
 from .._compat import StrEnum
 
+if TYPE_CHECKING:
+    from ..agent.config import AuditConfig
+    from ..tool.models import ToolCall, ToolContext, ToolResult
+
 
 class AuditEventType(StrEnum):
     """Types of audit events."""
@@ -34,6 +39,19 @@ class AuditEventType(StrEnum):
     AUTHENTICATION_ATTEMPT = "authentication_attempt"
 
 
+class SanitizeMode(StrEnum):
+    """How sensitive tool parameters are written to audit logs."""
+
+    # Log parameters unchanged
+    NONE = "none"
+    # Replace sensitive values with "[REDACTED]"
+    REDACT = "redact"
+    # Replace sensitive values with an HMAC-SHA256 digest keyed by
+    # AuditConfig.parameter_hash_key, so equal values can be correlated
+    # across events without being revealed. Requires the key.
+    HASH = "hash"
+
+
 class AuditEvent(BaseModel):
     """Base audit event with common fields."""
 
@@ -129,3 +147,107 @@ class AiResponseEvent(AuditEvent):
     # Tool calls in response
     tool_calls_count: int = 0
     tool_names: List[str] = Field(default_factory=list)
+
+
+class ToolEventPhase(StrEnum):
+    """Phases of a tool execution reported to the audit logger."""
+
+    START = "start"
+    END = "end"
+
+
+@dataclass
+class ToolEvent:
+    """A structured record of one phase of a tool execution.
+
+    The registry emits a START event once the access decision is made (and,
+    when access is granted, before the tool runs) and an END event carrying
+    the result. AuditLogger.log_tool_event() turns these into the individual
+    access check, invocation and result audit events enabled by the config.
+
+    Events are written after execution has moved on, so capture() copies
+    the values the audit events are built from when the event is created,
+    including the timestamp. The tool call, context and result themselves
+    are only kept for AuditLogger subclasses that override the convenience
+    methods.
+    """
+
+    phase: ToolEventPhase
+    audit_config: "AuditConfig"
+    tool_call: "ToolCall"
+    context: "ToolContext"
+    user_id: str
+    username: Optional[str]
+    user_email: Optional[str]
+    user_groups: Tuple[str, ...]
+    conversation_id: str
+    request_id: str
+    tool_call_id: str
+    tool_name: str
+    arguments: Dict[str, Any] = field(default_factory=dict)
+    access_granted: bool = True
+    required_groups: Tuple[str, ...] = ()
+    reason: Optional[str] = None
+    ui_features: Tuple[str, ...] = ()
+    result: Optional["ToolResult"] = None
+    success: bool = False
+    error: Optional[str] = None
+    result_for_llm: Optional[str] = None
+    ui_component_type: Optional[str] = None
+    duration_ms: Optional[int] = None
+    timestamp: datetime = field(default_factory=datetime.utcnow)
+    # Audit records already written for this event, so that writing it again
+    # after an interruption skips them
+    records_written: int = field(default=0, compare=False)
+
+    @classmethod
+    def capture(
+        cls,
+        phase: ToolEventPhase,
+        tool_call: "ToolCall",
+        context: "ToolContext",
+        audit_config: "AuditConfig",
+        *,
+        access_granted: bool = True,
+        required_groups: Sequence[str] = (),
+        reason: Optional[str] = None,
+        ui_features: Sequence[str] = (),
+        result: Optional["ToolResult"] = None,
+        duration_ms: Optional[int] = None,
+    ) -> "ToolEvent":
+        """Create an event from the current state of a tool call.
+
+        Only plain values are captured: strings, tuples of the user's and
+        required groups, and a shallow copy of the arguments of a permitted
+        START event.
+        """
+        user = context.user
+        event = cls(
+            phase=phase,
+            audit_config=audit_config,
+            tool_call=tool_call,
+            context=context,
+            user_id=user.id,
+            username=user.username,
+            user_email=user.email,
+            user_groups=tuple(user.group_memberships),
+            conversation_id=context.conversation_id,
+            request_id=context.request_id,
+            tool_call_id=tool_call.id,
+            tool_name=tool_call.name,
+            access_granted=access_granted,
+            required_groups=tuple(required_groups),
+            reason=reason,
+            ui_features=tuple(ui_features),
+            result=result,
+            duration_ms=duration_ms,
+        )
+        if phase == ToolEventPhase.START and access_granted:
+            event.arguments = dict(tool_call.arguments)
+        if result is not None:
+            event.success = result.success
+            event.error = result.error
+            event.result_for_llm = result.result_for_llm
+            if result.ui_component is not None:
+                event.ui_component_type = result.ui_component.__class__.__name__
+        return event
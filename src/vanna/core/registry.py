@@ -4,96 +4,328 @@ Tool registry for the Vanna Agents framework.
 This module provides the ToolRegistry class for managing and executing tools.
 """
 
+import asyncio
+import functools
+import logging
+import sys
 import time
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Type, TypeVar, Union
-
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from pydantic import TypeAdapter, ValidationError
+
+from .agent.config import AuditConfig
+from .audit.models import ToolEvent, ToolEventPhase
 from .tool import Tool, ToolCall, ToolContext, ToolRejection, ToolResult, ToolSchema
 from .user import User
 
 if TYPE_CHECKING:
     from .audit import AuditLogger
-    from .agent.config import AuditConfig
+
+logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
+# Bits of ToolRegistry._audit_flags
+_AUDIT_ACCESS_CHECKS = 1
+_AUDIT_INVOCATIONS = 2
+_AUDIT_RESULTS = 4
+_AUDIT_START = _AUDIT_ACCESS_CHECKS | _AUDIT_INVOCATIONS
 
-class _LocalToolWrapper(Tool[T]):
-    """Wrapper for tools with configurable access groups."""
+# Shared default for contexts without UI feature metadata
+_EMPTY_TUPLE: Tuple[str, ...] = ()
 
-    def __init__(self, wrapped_tool: Tool[T], access_groups: List[str]):
-        self._wrapped_tool = wrapped_tool
-        self._access_groups = access_groups
 
-    @property
-    def name(self) -> str:
-        return self._wrapped_tool.name
+def _error_result(msg: str) -> ToolResult:
+    """Build a failed ToolResult reporting msg to the LLM."""
+    return ToolResult(success=False, result_for_llm=msg, error=msg)
 
-    @property
-    def description(self) -> str:
-        return self._wrapped_tool.description
 
-    @property
-    def access_groups(self) -> List[str]:
-        return self._access_groups
+def _format_validation_error(error: ValidationError) -> str:
+    """Summarize a ValidationError as one line per invalid field."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'arguments'}: {err['msg']}"
+        for err in error.errors(include_url=False, include_context=False)
+    )
+
 
-    def get_args_schema(self) -> Type[T]:
-        return self._wrapped_tool.get_args_schema()
+class _AuditWriter:
+    """Audit queue and background writer task of one event loop."""
 
-    async def execute(self, context: ToolContext, args: T) -> ToolResult:
-        return await self._wrapped_tool.execute(context, args)
+    __slots__ = ("queue", "batch", "task", "wake", "flushes")
+
+    def __init__(self, queue: "asyncio.Queue[ToolEvent]") -> None:
+        self.queue = queue
+        # Events taken off the queue and not yet written
+        self.batch: List[ToolEvent] = []
+        self.task: Optional["asyncio.Task[None]"] = None
+        # Set while a flush is waiting, so the writer skips its batching delay
+        self.wake = asyncio.Event()
+        self.flushes = 0
 
 
 class ToolRegistry:
-    """Registry for managing tools."""
+    """Registry for managing tools.
+
+    Audit records produced during tool execution are queued and written by a
+    background task in batches of up to ``audit_batch_size`` records, at most
+    ``audit_flush_interval_ms`` after the first record of a batch arrives.
+    The queue holds ``audit_queue_size`` records; when it is full, execution
+    waits for the writer to catch up. Each event loop gets its own queue
+    and writer. Call close_audit_log() from the loop before it shuts down
+    (e.g. in a server's lifespan handler); records still queued when
+    asyncio.run() cancels the writer are also written. flush_audit_log()
+    writes the queued records without stopping the writer. Tool events in
+    batches the audit logger fails to write are logged and counted in
+    ``audit_events_dropped``.
+
+    Which tool events are audited is derived from ``audit_logger`` and
+    ``audit_config`` whenever either is assigned. Call refresh_audit_flags()
+    after mutating ``audit_config`` in place.
+
+    Tool schemas are generated at registration so get_schemas() does no
+    Pydantic work per request. Pass ``lazy_schemas=True`` to defer each
+    schema to the first get_schemas() call instead, which is cheaper for
+    registries holding many rarely used tools.
+
+    Tools that are open to all users get a specialized executor when nothing
+    else would run around them: no audit events are enabled and neither
+    transform_args(), _validate_tool_permissions() nor _check_access() is
+    overridden. It skips the tool lookup and permission check and goes
+    straight to validating the arguments and running the tool. The executors
+    are rebuilt whenever the audit flags are refreshed.
+    """
+
+    __slots__ = (
+        "_tools",
+        "_access_overrides",
+        "_access_cache",
+        "_args_models",
+        "_schemas_cache",
+        "_adapters",
+        "lazy_schemas",
+        "_custom_permissions",
+        "_custom_transform",
+        "_audit_flags",
+        "_audit_logger",
+        "_audit_config",
+        "audit_batch_size",
+        "audit_flush_interval_ms",
+        "audit_queue_size",
+        "_audit_writers",
+        "audit_events_dropped",
+        "_fast_paths",
+    )
 
     def __init__(
         self,
         audit_logger: Optional["AuditLogger"] = None,
-        audit_config: Optional["AuditConfig"] = None,
+        audit_config: Optional[AuditConfig] = None,
+        audit_batch_size: int = 100,
+        audit_flush_interval_ms: float = 50.0,
+        audit_queue_size: int = 10_000,
+        lazy_schemas: bool = False,
     ) -> None:
         self._tools: Dict[str, Tool[Any]] = {}
-        self.audit_logger = audit_logger
-        if audit_config is not None:
-            self.audit_config = audit_config
-        else:
-            from .agent.config import AuditConfig
+        # Access groups given at registration, overriding tool.access_groups
+        self._access_overrides: Dict[str, List[str]] = {}
+        # Effective access groups per tool name, frozen at registration time.
+        # None means the tool is accessible to all users.
+        self._access_cache: Dict[str, Optional[FrozenSet[str]]] = {}
+        # Args models and LLM schemas are fixed per tool, so build them once
+        self._args_models: Dict[str, Type[Any]] = {}
+        self._schemas_cache: Dict[str, ToolSchema] = {}
+        # Validators for tool arguments, compiled once per tool
+        self._adapters: Dict[str, TypeAdapter[Any]] = {}
+        self.lazy_schemas = lazy_schemas
+        # Subclasses may override _validate_tool_permissions (e.g. to look up
+        # groups remotely); only then is the async check awaited
+        self._custom_permissions = (
+            type(self)._validate_tool_permissions
+            is not ToolRegistry._validate_tool_permissions
+        )
+        # transform_args() is only awaited when a subclass overrides it
+        self._custom_transform = (
+            type(self).transform_args is not ToolRegistry.transform_args
+        )
+        # Specialized executors per tool name, see _build_fast_path
+        self._fast_paths: Dict[
+            str, Callable[[ToolCall, ToolContext], Awaitable[ToolResult]]
+        ] = {}
+        self._audit_flags = 0
+        self._audit_logger = audit_logger
+        self._audit_config = audit_config if audit_config is not None else AuditConfig()
+        self.refresh_audit_flags()
+
+        self.audit_batch_size = audit_batch_size
+        self.audit_flush_interval_ms = audit_flush_interval_ms
+        self.audit_queue_size = audit_queue_size
+        # Created lazily per running event loop by _audit_writer()
+        self._audit_writers: Dict[asyncio.AbstractEventLoop, _AuditWriter] = {}
+        # Tool events in batches the audit logger failed to write
+        self.audit_events_dropped = 0
 
-            self.audit_config = AuditConfig()
+    @property
+    def audit_logger(self) -> Optional["AuditLogger"]:
+        """Audit logger receiving tool events, if any."""
+        return self._audit_logger
+
+    @audit_logger.setter
+    def audit_logger(self, audit_logger: Optional["AuditLogger"]) -> None:
+        self._audit_logger = audit_logger
+        self.refresh_audit_flags()
+
+    @property
+    def audit_config(self) -> AuditConfig:
+        """Configuration deciding which tool events are audited."""
+        return self._audit_config
+
+    @audit_config.setter
+    def audit_config(self, audit_config: AuditConfig) -> None:
+        self._audit_config = audit_config
+        self.refresh_audit_flags()
+
+    def refresh_audit_flags(self) -> None:
+        """Recompute which tool events are audited from the current config."""
+        flags = 0
+        config = self._audit_config
+        if self._audit_logger is not None:
+            if config.log_tool_access_checks:
+                flags |= _AUDIT_ACCESS_CHECKS
+            if config.log_tool_invocations:
+                flags |= _AUDIT_INVOCATIONS
+            if config.log_tool_results:
+                flags |= _AUDIT_RESULTS
+        self._audit_flags = flags
+
+        self._fast_paths.clear()
+        for name in self._tools:
+            self._build_fast_path(name)
 
     def register_local_tool(self, tool: Tool[Any], access_groups: List[str]) -> None:
         """Register a local tool with optional access group restrictions.
 
+        Tool names are interned with sys.intern(), so lookups with an
+        interned name (e.g. ToolCall names interned by the LLM integration)
+        match on identity without comparing string contents.
+
         Args:
             tool: The tool to register
             access_groups: List of groups that can access this tool.
                           If None or empty, tool is accessible to all users.
         """
-        if tool.name in self._tools:
-            raise ValueError(f"Tool '{tool.name}' already registered")
+        name = sys.intern(tool.name)
+        if name in self._tools:
+            raise ValueError(f"Tool '{name}' already registered")
+
+        effective_groups = access_groups or tool.access_groups
+        self._access_cache[name] = (
+            frozenset(effective_groups) if effective_groups else None
+        )
 
         if access_groups:
-            # Wrap the tool with access groups
-            wrapped_tool = _LocalToolWrapper(tool, access_groups)
-            self._tools[tool.name] = wrapped_tool
-        else:
-            # No access restrictions, register as-is
-            self._tools[tool.name] = tool
+            self._access_overrides[name] = access_groups
+
+        self._tools[name] = tool
+        args_model = tool.get_args_schema()
+        self._args_models[name] = args_model
+        self._adapters[name] = TypeAdapter(args_model)
+        if not self.lazy_schemas:
+            self._build_schema(tool)
+        self._build_fast_path(name)
+
+    def _build_fast_path(self, name: str) -> None:
+        """Register a specialized executor for a tool if it is eligible.
+
+        Eligible tools have no access restrictions, and the registry has no
+        audit events enabled and no transform_args(), _check_access() or
+        _validate_tool_permissions() override. For these, execute() reduces
+        to _validate_and_run().
+        """
+        if (
+            self._audit_flags
+            or self._custom_permissions
+            or self._custom_transform
+            or self._access_cache[name] is not None
+            or type(self)._check_access is not ToolRegistry._check_access
+        ):
+            return
 
-    async def get_tool(self, name: str) -> Optional[Tool[Any]]:
+        self._fast_paths[name] = functools.partial(
+            self._validate_and_run, self._tools[name], self._adapters[name]
+        )
+
+    def _build_schema(self, tool: Tool[Any]) -> ToolSchema:
+        """Generate and cache the LLM schema for a registered tool."""
+        schema = tool.get_schema()
+        access_groups = self._access_overrides.get(tool.name)
+        if access_groups:
+            schema = schema.model_copy(update={"access_groups": access_groups})
+        self._schemas_cache[tool.name] = schema
+        return schema
+
+    def _get_schema(self, name: str) -> ToolSchema:
+        """Return the cached schema for a tool, building it if deferred."""
+        schema = self._schemas_cache.get(name)
+        if schema is None:
+            schema = self._build_schema(self._tools[name])
+        return schema
+
+    def get_tool(self, name: str) -> Optional[Tool[Any]]:
         """Get a tool by name."""
         return self._tools.get(name)
 
-    async def list_tools(self) -> List[str]:
+    def list_tools(self) -> List[str]:
         """List all registered tool names."""
         return list(self._tools.keys())
 
+    async def get_tool_async(self, name: str) -> Optional[Tool[Any]]:
+        """Get a tool by name (awaitable variant of get_tool)."""
+        return self._tools.get(name)
+
+    async def list_tools_async(self) -> List[str]:
+        """List all registered tool names (awaitable variant of list_tools)."""
+        return list(self._tools.keys())
+
     async def get_schemas(self, user: Optional[User] = None) -> List[ToolSchema]:
-        """Get schemas for all tools accessible to user."""
-        schemas = []
-        for tool in self._tools.values():
-            if user is None or await self._validate_tool_permissions(tool, user):
-                schemas.append(tool.get_schema())
-        return schemas
+        """Get schemas for all tools accessible to user.
+
+        When _validate_tool_permissions() is overridden, permission checks for
+        all tools run concurrently, so subclasses whose check does I/O pay one
+        round trip, not one per tool. The tool dict is only mutated by
+        register_local_tool(), so it can be iterated safely while the checks
+        are in flight.
+        """
+        if user is None:
+            return [self._get_schema(name) for name in self._tools]
+
+        if not self._custom_permissions:
+            return [
+                self._get_schema(name)
+                for name in self._tools
+                if self._check_access(name, user)
+            ]
+
+        allowed = await asyncio.gather(
+            *(self._validate_tool_permissions(t, user) for t in self._tools.values())
+        )
+        return [self._get_schema(name) for name, ok in zip(self._tools, allowed) if ok]
+
+    def _tool_access_groups(self, tool: Tool[Any]) -> List[str]:
+        """Return the access groups in effect for a registered tool."""
+        return self._access_overrides.get(tool.name, tool.access_groups)
 
     async def _validate_tool_permissions(self, tool: Tool[Any], user: User) -> bool:
         """Validate if user has access to tool based on group membership.
@@ -101,14 +333,141 @@ class ToolRegistry:
         Checks for intersection between user's group memberships and tool's access groups.
         If tool has no access groups specified, it's accessible to all users.
         """
-        tool_access_groups = tool.access_groups
-        if not tool_access_groups:
+        if tool.name in self._access_cache:
+            return self._check_access(tool.name, user)
+
+        # Tool was not registered through this registry
+        tool_groups = frozenset(tool.access_groups)
+        return not tool_groups or not tool_groups.isdisjoint(user.group_memberships)
+
+    def _check_access(self, tool_name: str, user: User) -> bool:
+        """Check a registered tool's cached access groups against the user's."""
+        tool_groups = self._access_cache.get(tool_name)
+        if tool_groups is None:
             return True
 
-        user_groups = set(user.group_memberships)
-        tool_groups = set(tool_access_groups)
         # Grant access if any group in user.group_memberships exists in tool.access_groups
-        return bool(user_groups & tool_groups)
+        return not tool_groups.isdisjoint(user.group_memberships)
+
+    def _audit_writer(self) -> _AuditWriter:
+        """Return the running loop's audit writer, starting it if needed.
+
+        Records left queued by a stopped writer, or by the writer of a loop
+        that was closed without close_audit_log(), move to the new writer
+        so none are dropped.
+        """
+        loop = asyncio.get_running_loop()
+        writer = self._audit_writers.get(loop)
+        if writer is not None and writer.task is not None and not writer.task.done():
+            return writer
+
+        new_writer = _AuditWriter(asyncio.Queue(maxsize=self.audit_queue_size))
+        for other_loop, other in list(self._audit_writers.items()):
+            if other is writer or other_loop.is_closed():
+                for event in other.batch:
+                    new_writer.queue.put_nowait(event)
+                while not other.queue.empty():
+                    new_writer.queue.put_nowait(other.queue.get_nowait())
+                self._audit_writers.pop(other_loop, None)
+        new_writer.task = loop.create_task(self._write_audit_batches(new_writer))
+        self._audit_writers[loop] = new_writer
+        return new_writer
+
+    async def _enqueue_audit(self, event: ToolEvent) -> None:
+        """Queue a tool event for the background audit writer.
+
+        Only waits when the queue is full, to apply back-pressure.
+        """
+        queue = self._audit_writer().queue
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            await queue.put(event)
+
+    async def _write_audit_batches(self, writer: _AuditWriter) -> None:
+        """Drain the audit queue, writing events in order in batches.
+
+        When the writer is cancelled, e.g. by close_audit_log() or by
+        asyncio.run() shutting down the loop, the batch in hand and every
+        record still queued are written before it stops.
+        """
+        queue = writer.queue
+        batch = writer.batch
+        try:
+            while True:
+                batch.append(await queue.get())
+                if queue.qsize() < self.audit_batch_size - 1:
+                    # Give the batch a chance to fill up before writing,
+                    # unless a flush is waiting for it
+                    try:
+                        await asyncio.wait_for(
+                            writer.wake.wait(), self.audit_flush_interval_ms / 1000
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+
+                while len(batch) < self.audit_batch_size and not queue.empty():
+                    batch.append(queue.get_nowait())
+
+                await self._write_audit_batch(batch)
+                for _ in batch:
+                    queue.task_done()
+                batch = writer.batch = []
+        except asyncio.CancelledError:
+            # Events of a batch interrupted mid-write remember which records
+            # were written, so passing the batch again writes only the rest
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            if batch:
+                await self._write_audit_batch(batch)
+                for _ in batch:
+                    queue.task_done()
+            raise
+
+    async def _write_audit_batch(self, batch: List[ToolEvent]) -> None:
+        """Pass one batch of tool events to the audit logger."""
+        try:
+            if self.audit_logger:
+                await self.audit_logger.log_batch(batch)
+        except Exception as e:
+            # Don't take down the writer if audit logging fails. The batch is
+            # not retried, so a logger that keeps failing cannot hold back
+            # every later record.
+            self.audit_events_dropped += len(batch)
+            logger.error(
+                f"Failed to write audit records, dropped {len(batch)} tool "
+                f"events ({self.audit_events_dropped} in total): {e}",
+                exc_info=True,
+            )
+
+    async def flush_audit_log(self) -> None:
+        """Write the audit records queued in the running loop now.
+
+        Waits until they are written, without the writer's batching delay.
+        """
+        if not self._audit_writers:
+            return
+        writer = self._audit_writer()
+        writer.flushes += 1
+        writer.wake.set()
+        try:
+            await writer.queue.join()
+        finally:
+            writer.flushes -= 1
+            if not writer.flushes:
+                writer.wake.clear()
+
+    async def close_audit_log(self) -> None:
+        """Write the audit records queued in the running loop and stop its writer.
+
+        Call this before the loop shuts down. A later audited call starts a
+        new writer.
+        """
+        await self.flush_audit_log()
+        writer = self._audit_writers.pop(asyncio.get_running_loop(), None)
+        if writer is not None and writer.task is not None:
+            writer.task.cancel()
+            await asyncio.wait([writer.task])
 
     async def transform_args(
         self,
@@ -147,132 +506,129 @@ class ToolRegistry:
         context: ToolContext,
     ) -> ToolResult:
         """Execute a tool call with validation."""
-        tool = await self.get_tool(tool_call.name)
-        if not tool:
+        fast_path = self._fast_paths.get(tool_call.name)
+        if fast_path is not None:
+            return await fast_path(tool_call, context)
+
+        tool = self._tools.get(tool_call.name)
+        if tool is None:
             msg = f"Tool '{tool_call.name}' not found"
-            return ToolResult(
-                success=False,
-                result_for_llm=msg,
-                ui_component=None,
-                error=msg,
-            )
+            return _error_result(msg)
 
         # Validate group access
-        if not await self._validate_tool_permissions(tool, context.user):
+        if self._custom_permissions:
+            allowed = await self._validate_tool_permissions(tool, context.user)
+        else:
+            allowed = self._check_access(tool_call.name, context.user)
+        if not allowed:
             msg = f"Insufficient group access for tool '{tool_call.name}'"
 
             # Audit access denial
-            if (
-                self.audit_logger
-                and self.audit_config
-                and self.audit_config.log_tool_access_checks
-            ):
-                await self.audit_logger.log_tool_access_check(
-                    user=context.user,
-                    tool_name=tool_call.name,
-                    access_granted=False,
-                    required_groups=tool.access_groups,
-                    context=context,
-                    reason=msg,
+            if self._audit_flags & _AUDIT_ACCESS_CHECKS:
+                await self._enqueue_audit(
+                    ToolEvent.capture(
+                        ToolEventPhase.START,
+                        tool_call,
+                        context,
+                        self._audit_config,
+                        access_granted=False,
+                        required_groups=self._tool_access_groups(tool),
+                        reason=msg,
+                    )
                 )
 
-            return ToolResult(
-                success=False,
-                result_for_llm=msg,
-                ui_component=None,
-                error=msg,
-            )
+            return _error_result(msg)
 
+        return await self._validate_and_run(
+            tool, self._adapters[tool.name], tool_call, context
+        )
+
+    async def _validate_and_run(
+        self,
+        tool: Tool[Any],
+        adapter: TypeAdapter[Any],
+        tool_call: ToolCall,
+        context: ToolContext,
+    ) -> ToolResult:
+        """Validate the arguments of a permitted tool call and run the tool.
+
+        Shared by execute() and the specialized executors. The transform and
+        audit steps only run when the registry has them.
+        """
         # Validate and parse arguments
         try:
-            args_model = tool.get_args_schema()
-            validated_args = args_model.model_validate(tool_call.arguments)
+            validated_args = adapter.validate_python(tool_call.arguments)
+        except ValidationError as e:
+            msg = f"Invalid arguments: {_format_validation_error(e)}"
+            return _error_result(msg)
         except Exception as e:
-            msg = f"Invalid arguments: {str(e)}"
-            return ToolResult(
-                success=False,
-                result_for_llm=msg,
-                ui_component=None,
-                error=msg,
+            # Validators raising anything but ValueError/AssertionError point
+            # to a bug in the args model rather than in the LLM's arguments
+            logger.error(
+                f"Argument validation for tool '{tool_call.name}' failed: {e}",
+                exc_info=True,
             )
+            msg = f"Execution failed: {str(e)}"
+            return _error_result(msg)
 
         # Transform/validate arguments based on user context
-        transform_result = await self.transform_args(
-            tool=tool,
-            args=validated_args,
-            user=context.user,
-            context=context,
-        )
-
-        if isinstance(transform_result, ToolRejection):
-            return ToolResult(
-                success=False,
-                result_for_llm=transform_result.reason,
-                ui_component=None,
-                error=transform_result.reason,
-            )
-
-        # Use transformed arguments for execution
-        final_args = transform_result
-
-        # Audit successful access check
-        if (
-            self.audit_logger
-            and self.audit_config
-            and self.audit_config.log_tool_access_checks
-        ):
-            await self.audit_logger.log_tool_access_check(
+        final_args = validated_args
+        if self._custom_transform:
+            transform_result = await self.transform_args(
+                tool=tool,
+                args=validated_args,
                 user=context.user,
-                tool_name=tool_call.name,
-                access_granted=True,
-                required_groups=tool.access_groups,
                 context=context,
             )
 
-        # Audit tool invocation
-        if (
-            self.audit_logger
-            and self.audit_config
-            and self.audit_config.log_tool_invocations
-        ):
-            # Get UI features if available from context
-            ui_features = context.metadata.get("ui_features_available", [])
-            await self.audit_logger.log_tool_invocation(
-                user=context.user,
-                tool_call=tool_call,
-                ui_features=ui_features,
-                context=context,
-                sanitize_parameters=self.audit_config.sanitize_tool_parameters,
+            if isinstance(transform_result, ToolRejection):
+                return _error_result(transform_result.reason)
+
+            # Use transformed arguments for execution
+            final_args = transform_result
+
+        # Audit successful access check and tool invocation
+        if self._audit_flags & _AUDIT_START:
+            # UI features are only recorded on invocation events
+            ui_features = (
+                context.metadata.get("ui_features_available", _EMPTY_TUPLE)
+                if self._audit_flags & _AUDIT_INVOCATIONS
+                else _EMPTY_TUPLE
+            )
+            await self._enqueue_audit(
+                ToolEvent.capture(
+                    ToolEventPhase.START,
+                    tool_call,
+                    context,
+                    self._audit_config,
+                    required_groups=self._tool_access_groups(tool),
+                    ui_features=ui_features,
+                )
             )
 
         # Execute tool with context-first signature
         try:
-            start_time = time.perf_counter()
+            start_ns = time.monotonic_ns()
             result = await tool.execute(context, final_args)
-            execution_time_ms = (time.perf_counter() - start_time) * 1000
+            execution_time_ms = (time.monotonic_ns() - start_ns) // 1_000_000
 
             # Add execution time to metadata
             result.metadata["execution_time_ms"] = execution_time_ms
 
             # Audit tool result
-            if (
-                self.audit_logger
-                and self.audit_config
-                and self.audit_config.log_tool_results
-            ):
-                await self.audit_logger.log_tool_result(
-                    user=context.user,
-                    tool_call=tool_call,
-                    result=result,
-                    context=context,
+            if self._audit_flags & _AUDIT_RESULTS:
+                await self._enqueue_audit(
+                    ToolEvent.capture(
+                        ToolEventPhase.END,
+                        tool_call,
+                        context,
+                        self._audit_config,
+                        result=result,
+                        duration_ms=execution_time_ms,
+                    )
                 )
 
             return result
         except Exception as e:
             msg = f"Execution failed: {str(e)}"
-            return ToolResult(
-                success=False,
-                result_for_llm=msg,
-                ui_component=None,
-                error=msg,
-            )
+            return _error_result(msg)
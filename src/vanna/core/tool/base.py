@@ -5,7 +5,7 @@ This module contains the abstract base class for tools.
 """
 
 from abc import ABC, abstractmethod
-from typing import Generic, List, Type, TypeVar
+from typing import Any, Generic, List, Optional, Type, TypeVar, cast
 
 from .models import ToolContext, ToolResult, ToolSchema
 
@@ -52,19 +52,26 @@ class Tool(ABC, Generic[T]):
         pass
 
     def get_schema(self) -> ToolSchema:
-        """Generate tool schema for LLM."""
-        from typing import Any, cast
+        """Generate tool schema for LLM.
+
+        The schema is built once per tool instance and reused afterwards.
+        """
+        cached: Optional[ToolSchema] = getattr(self, "_cached_schema", None)
+        if cached is not None:
+            return cached
 
         args_model = self.get_args_schema()
         # Get the schema - args_model should be a Pydantic model class
         schema = (
-            cast(Any, args_model).model_json_schema()
+            cast(Any, args_model).model_json_schema(mode="validation")
             if hasattr(args_model, "model_json_schema")
             else {}
         )
-        return ToolSchema(
+        tool_schema = ToolSchema(
             name=self.name,
             description=self.description,
             parameters=schema,
             access_groups=self.access_groups,
         )
+        self._cached_schema = tool_schema
+        return tool_schema
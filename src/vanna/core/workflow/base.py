@@ -104,7 +104,7 @@ class WorkflowHandler(ABC):
 
                 # Execute tool for reports
                 if message.startswith("/report"):
-                    tool = await agent.tool_registry.get_tool("generate_report")
+                    tool = agent.tool_registry.get_tool("generate_report")
                     result = await tool.execute(ToolContext(user=user), {})
                     return WorkflowResult(should_skip_llm=True, components=[result.ui_component])
 
@@ -169,7 +169,7 @@ class WorkflowHandler(ABC):
                 # Pattern matching with tool execution
                 if message.startswith("/report"):
                     # Execute tool from registry
-                    tool = await agent.tool_registry.get_tool("generate_sales_report")
+                    tool = agent.tool_registry.get_tool("generate_sales_report")
                     context = ToolContext(user=user, conversation=conversation)
                     result = await tool.execute(context, {})
 
@@ -2,7 +2,8 @@
 FastAPI server factory for Vanna Agents.
 """
 
-from typing import Any, Dict, Optional
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -33,8 +34,16 @@ class VannaFastAPIServer:
         Returns:
             Configured FastAPI application
         """
-        # Create FastAPI app
-        app_config = self.config.get("fastapi", {})
+        agent = self.agent
+
+        @asynccontextmanager
+        async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+            yield
+            # Write queued tool audit records before the server stops
+            await agent.tool_registry.close_audit_log()
+
+        # Create FastAPI app; a lifespan given in the config replaces ours
+        app_config = {"lifespan": lifespan, **self.config.get("fastapi", {})}
         app = FastAPI(
             title="Vanna Agents API",
             description="API server for Vanna Agents framework",
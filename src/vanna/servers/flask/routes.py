@@ -79,6 +79,10 @@ def register_chat_routes(
                 except StopAsyncIteration:
                     yield "data: [DONE]\n\n"
             finally:
+                # Write queued tool audit records before the loop goes away
+                loop.run_until_complete(
+                    chat_handler.agent.tool_registry.close_audit_log()
+                )
                 loop.close()
 
         return Response(
@@ -134,4 +138,6 @@ def register_chat_routes(
             traceback.print_exc()
             return jsonify({"error": f"Chat failed: {str(e)}"}), 500
         finally:
+            # Write queued tool audit records before the loop goes away
+            loop.run_until_complete(chat_handler.agent.tool_registry.close_audit_log())
             loop.close()
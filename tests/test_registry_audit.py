@@ -0,0 +1,442 @@
+"""
+Tests for audit logging performed by the ToolRegistry.
+"""
+
+import asyncio
+import gc
+import hashlib
+import hmac
+from datetime import datetime
+from typing import List, Type
+
+import pytest
+from pydantic import BaseModel, Field
+
+from vanna.core.agent.config import AuditConfig
+from vanna.core.audit import (
+    AuditEvent,
+    AuditEventType,
+    AuditLogger,
+    SanitizeMode,
+    ToolAccessCheckEvent,
+    ToolEvent,
+    ToolEventPhase,
+    ToolInvocationEvent,
+    ToolResultEvent,
+)
+from vanna.core.registry import ToolRegistry
+from vanna.core.tool import Tool, ToolCall, ToolContext, ToolResult
+from vanna.core.user import User
+from vanna.integrations.local.agent_memory import DemoAgentMemory
+
+
+class EchoArgs(BaseModel):
+    """Args for the echo tool."""
+
+    message: str = Field(description="A message")
+
+
+class EchoTool(Tool[EchoArgs]):
+    """Tool that echoes its message back."""
+
+    @property
+    def name(self) -> str:
+        return "echo"
+
+    @property
+    def description(self) -> str:
+        return "Echo a message"
+
+    def get_args_schema(self) -> Type[EchoArgs]:
+        return EchoArgs
+
+    async def execute(self, context: ToolContext, args: EchoArgs) -> ToolResult:
+        return ToolResult(success=True, result_for_llm=args.message)
+
+
+class RecordingAuditLogger(AuditLogger):
+    """Audit logger that keeps events in memory."""
+
+    def __init__(self) -> None:
+        self.events: List[AuditEvent] = []
+        self.batch_sizes: List[int] = []
+
+    async def log_event(self, event: AuditEvent) -> None:
+        self.events.append(event)
+
+    async def log_batch(self, events):  # type: ignore[no-untyped-def]
+        self.batch_sizes.append(len(events))
+        await super().log_batch(events)
+
+
+@pytest.fixture
+def context():
+    """Tool context for a regular user."""
+    return ToolContext(
+        user=User(id="user_1", username="user", group_memberships=["user"]),
+        conversation_id="test_conv",
+        request_id="test_req",
+        agent_memory=DemoAgentMemory(max_items=100),
+    )
+
+
+@pytest.mark.asyncio
+async def test_audit_records_written_in_order(context):
+    """Access check, invocation and result events are written in order."""
+    audit_logger = RecordingAuditLogger()
+    registry = ToolRegistry(audit_logger=audit_logger)
+    registry.register_local_tool(EchoTool(), access_groups=[])
+
+    tool_call = ToolCall(id="call_1", name="echo", arguments={"message": "hi"})
+    result = await registry.execute(tool_call, context)
+    await registry.flush_audit_log()
+
+    assert result.success is True
+    assert [event.event_type for event in audit_logger.events] == [
+        AuditEventType.TOOL_ACCESS_CHECK,
+        AuditEventType.TOOL_INVOCATION,
+        AuditEventType.TOOL_RESULT,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_audit_records_are_batched(context):
+    """Events queued close together are written in a single batch."""
+    audit_logger = RecordingAuditLogger()
+    registry = ToolRegistry(audit_logger=audit_logger, audit_batch_size=100)
+    registry.register_local_tool(EchoTool(), access_groups=[])
+
+    for i in range(5):
+        tool_call = ToolCall(id=f"call_{i}", name="echo", arguments={"message": "hi"})
+        await registry.execute(tool_call, context)
+    await registry.flush_audit_log()
+
+    # One start and one end tool event per call
+    assert audit_logger.batch_sizes == [10]
+    assert len(audit_logger.events) == 15
+
+
+def test_audit_records_written_when_loop_shuts_down(context):
+    """Records still queued when asyncio.run() returns are not lost."""
+    audit_logger = RecordingAuditLogger()
+    registry = ToolRegistry(audit_logger=audit_logger)
+    registry.register_local_tool(EchoTool(), access_groups=[])
+    tool_call = ToolCall(id="call_1", name="echo", arguments={"message": "hi"})
+
+    asyncio.run(registry.execute(tool_call, context))
+    assert len(audit_logger.events) == 3
+
+    # A later loop gets a new writer
+    asyncio.run(registry.execute(tool_call, context))
+    assert len(audit_logger.events) == 6
+
+
+def test_interrupted_batch_is_not_written_twice(context):
+    """A batch cancelled mid-write is finished without duplicate records."""
+
+    class SlowAuditLogger(RecordingAuditLogger):
+        def __init__(self) -> None:
+            super().__init__()
+            self.writing_result = asyncio.Event()
+
+        async def log_event(self, event: AuditEvent) -> None:
+            if isinstance(event, ToolResultEvent) and not self.writing_result.is_set():
+                # Stall on the last record until the loop shuts down
+                self.writing_result.set()
+                await asyncio.sleep(10)
+            self.events.append(event)
+
+    audit_logger = SlowAuditLogger()
+    registry = ToolRegistry(audit_logger=audit_logger)
+    registry.register_local_tool(EchoTool(), access_groups=[])
+    tool_call = ToolCall(id="call_1", name="echo", arguments={"message": "hi"})
+
+    async def run() -> None:
+        await registry.execute(tool_call, context)
+        await audit_logger.writing_result.wait()
+
+    asyncio.run(run())
+
+    assert [event.event_type for event in audit_logger.events] == [
+        AuditEventType.TOOL_ACCESS_CHECK,
+        AuditEventType.TOOL_INVOCATION,
+        AuditEventType.TOOL_RESULT,
+    ]
+
+
+# The writer left pending on the closed loop is discarded unfinished
+@pytest.mark.filterwarnings("ignore:coroutine .* was never awaited")
+def test_records_of_closed_loop_are_kept(context):
+    """Records left by a loop closed without close_audit_log() are written."""
+    audit_logger = RecordingAuditLogger()
+    registry = ToolRegistry(audit_logger=audit_logger)
+    registry.register_local_tool(EchoTool(), access_groups=[])
+    tool_call = ToolCall(id="call_1", name="echo", arguments={"message": "hi"})
+
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(registry.execute(tool_call, context))
+    loop.close()
+    assert audit_logger.events == []
+
+    asyncio.run(registry.close_audit_log())
+    assert len(audit_logger.events) == 3
+    gc.collect()
+
+
+@pytest.mark.asyncio
+async def test_close_audit_log_writes_pending_records(context):
+    """close_audit_log() writes queued records and stops the writer."""
+    audit_logger = RecordingAuditLogger()
+    registry = ToolRegistry(audit_logger=audit_logger)
+    registry.register_local_tool(EchoTool(), access_groups=[])
+
+    tool_call = ToolCall(id="call_1", name="echo", arguments={"message": "hi"})
+    await registry.execute(tool_call, context)
+    await registry.close_audit_log()
+
+    assert len(audit_logger.events) == 3
+    assert not registry._audit_writers
+
+
+@pytest.mark.asyncio
+async def test_flush_audit_log_skips_batching_delay(context):
+    """A flush writes queued records without waiting out the interval."""
+    audit_logger = RecordingAuditLogger()
+    registry = ToolRegistry(audit_logger=audit_logger, audit_flush_interval_ms=10_000)
+    registry.register_local_tool(EchoTool(), access_groups=[])
+
+    tool_call = ToolCall(id="call_1", name="echo", arguments={"message": "hi"})
+    await registry.execute(tool_call, context)
+    await asyncio.wait_for(registry.flush_audit_log(), timeout=1)
+
+    assert len(audit_logger.events) == 3
+    await registry.close_audit_log()
+
+
+@pytest.mark.asyncio
+async def test_audit_records_reflect_queue_time_state(context):
+    """Records carry the time and state of the call, not of the write."""
+    audit_logger = RecordingAuditLogger()
+    registry = ToolRegistry(audit_logger=audit_logger)
+    registry.register_local_tool(EchoTool(), access_groups=[])
+
+    tool_call = ToolCall(id="call_1", name="echo", arguments={"message": "hi"})
+    result = await registry.execute(tool_call, context)
+    executed_at = datetime.utcnow()
+
+    # Changes made after the call must not leak into its records
+    tool_call.arguments["message"] = "changed"
+    context.user.group_memberships.append("admin")
+    result.metadata["execution_time_ms"] = 10_000
+    await registry.flush_audit_log()
+
+    assert all(event.timestamp <= executed_at for event in audit_logger.events)
+    access_check, invocation, tool_result = audit_logger.events
+    assert access_check.user_groups == ["user"]
+    assert isinstance(invocation, ToolInvocationEvent)
+    assert invocation.parameters == {"message": "hi"}
+    assert isinstance(tool_result, ToolResultEvent)
+    assert tool_result.execution_time_ms < 10_000
+
+
+@pytest.mark.asyncio
+async def test_failed_audit_writes_are_reported(context, caplog):
+    """Events the logger fails to write are logged and counted."""
+
+    class FailingAuditLogger(RecordingAuditLogger):
+        async def log_event(self, event: AuditEvent) -> None:
+            raise RuntimeError("audit store unavailable")
+
+    registry = ToolRegistry(audit_logger=FailingAuditLogger())
+    registry.register_local_tool(EchoTool(), access_groups=[])
+
+    tool_call = ToolCall(id="call_1", name="echo", arguments={"message": "hi"})
+    result = await registry.execute(tool_call, context)
+    await registry.close_audit_log()
+
+    assert result.success is True
+    assert registry.audit_events_dropped == 2
+    assert "dropped 2 tool events" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_audit_config_filters_events(context):
+    """Audit config flags decide which events the logger emits."""
+    audit_logger = RecordingAuditLogger()
+    registry = ToolRegistry(
+        audit_logger=audit_logger,
+        audit_config=AuditConfig(log_tool_access_checks=False),
+    )
+    registry.register_local_tool(EchoTool(), access_groups=[])
+
+    tool_call = ToolCall(id="call_1", name="echo", arguments={"message": "hi"})
+    await registry.execute(tool_call, context)
+    await registry.flush_audit_log()
+
+    assert [event.event_type for event in audit_logger.events] == [
+        AuditEventType.TOOL_INVOCATION,
+        AuditEventType.TOOL_RESULT,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_audit_access_denied(context):
+    """A denied call only logs the failed access check."""
+    audit_logger = RecordingAuditLogger()
+    registry = ToolRegistry(audit_logger=audit_logger)
+    registry.register_local_tool(EchoTool(), access_groups=["admin"])
+
+    tool_call = ToolCall(id="call_1", name="echo", arguments={"message": "hi"})
+    result = await registry.execute(tool_call, context)
+    await registry.flush_audit_log()
+
+    assert result.success is False
+    assert len(audit_logger.events) == 1
+    event = audit_logger.events[0]
+    assert isinstance(event, ToolAccessCheckEvent)
+    assert event.access_granted is False
+    assert event.required_groups == ["admin"]
+
+
+def test_parameter_hash_key_is_secret():
+    """The hash key is required for HASH and never serialized in clear."""
+    with pytest.raises(ValueError, match="parameter_hash_key"):
+        AuditConfig(sanitize_tool_parameters=SanitizeMode.HASH)
+
+    config = AuditConfig(
+        sanitize_tool_parameters=SanitizeMode.HASH, parameter_hash_key="audit-key"
+    )
+    assert "audit-key" not in config.model_dump_json()
+    assert "audit-key" not in repr(config)
+
+
+@pytest.mark.asyncio
+async def test_result_event_uses_measured_duration(context):
+    """The result event reports the duration measured by the registry."""
+    audit_logger = RecordingAuditLogger()
+    tool_call = ToolCall(id="call_1", name="echo", arguments={"message": "hi"})
+    result = ToolResult(success=True, result_for_llm="hi")
+
+    await audit_logger.log_tool_event(
+        ToolEvent.capture(
+            ToolEventPhase.END,
+            tool_call,
+            context,
+            AuditConfig(),
+            result=result,
+            duration_ms=42,
+        )
+    )
+
+    event = audit_logger.events[0]
+    assert isinstance(event, ToolResultEvent)
+    assert event.execution_time_ms == 42
+
+
+class LegacyAuditLogger(RecordingAuditLogger):
+    """Audit logger overriding the convenience methods with old signatures."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls: List[str] = []
+
+    async def log_tool_access_check(  # type: ignore[override]
+        self, user, tool_name, access_granted, required_groups, context, reason=None
+    ) -> None:
+        self.calls.append("access_check")
+
+    async def log_tool_invocation(  # type: ignore[override]
+        self, user, tool_call, ui_features, context, sanitize_parameters=True
+    ) -> None:
+        self.calls.append("invocation")
+
+    async def log_tool_result(  # type: ignore[override]
+        self, user, tool_call, result, context
+    ) -> None:
+        self.calls.append("result")
+
+
+@pytest.mark.asyncio
+async def test_legacy_convenience_method_overrides(context):
+    """Overrides without the newer optional arguments are still called."""
+    audit_logger = LegacyAuditLogger()
+    registry = ToolRegistry(audit_logger=audit_logger)
+    registry.register_local_tool(EchoTool(), access_groups=[])
+
+    tool_call = ToolCall(id="call_1", name="echo", arguments={"message": "hi"})
+    await registry.execute(tool_call, context)
+    await registry.flush_audit_log()
+
+    assert audit_logger.calls == ["access_check", "invocation", "result"]
+
+
+@pytest.mark.asyncio
+async def test_audit_logger_assigned_after_construction(context):
+    """Assigning the logger later (as Agent does) enables auditing."""
+    audit_logger = RecordingAuditLogger()
+    registry = ToolRegistry()
+    registry.register_local_tool(EchoTool(), access_groups=[])
+    registry.audit_logger = audit_logger
+
+    tool_call = ToolCall(id="call_1", name="echo", arguments={"message": "hi"})
+    await registry.execute(tool_call, context)
+    await registry.flush_audit_log()
+    assert len(audit_logger.events) == 3
+
+    registry.audit_config.log_tool_results = False
+    registry.refresh_audit_flags()
+    await registry.execute(tool_call, context)
+    await registry.flush_audit_log()
+    assert len(audit_logger.events) == 5
+
+
+@pytest.mark.asyncio
+async def test_audited_tools_skip_fast_path(context):
+    """Unrestricted tools lose their fast path once auditing is enabled."""
+    registry = ToolRegistry()
+    registry.register_local_tool(EchoTool(), access_groups=[])
+    assert "echo" in registry._fast_paths
+
+    registry.audit_logger = RecordingAuditLogger()
+    assert "echo" not in registry._fast_paths
+
+    registry.audit_logger = None
+    assert "echo" in registry._fast_paths
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "mode, hash_key, expected",
+    [
+        (SanitizeMode.NONE, None, "hunter2"),
+        (SanitizeMode.REDACT, None, "[REDACTED]"),
+        (
+            SanitizeMode.HASH,
+            "audit-key",
+            "hmac-sha256:"
+            + hmac.new(b"audit-key", b"hunter2", hashlib.sha256).hexdigest(),
+        ),
+        (SanitizeMode.HASH, None, "[REDACTED]"),
+    ],
+)
+async def test_invocation_parameter_sanitization(context, mode, hash_key, expected):
+    """Sensitive parameters are logged according to the sanitize mode."""
+    audit_logger = RecordingAuditLogger()
+    tool_call = ToolCall(
+        id="call_1", name="echo", arguments={"message": "hi", "password": "hunter2"}
+    )
+
+    await audit_logger.log_tool_invocation(
+        user=context.user,
+        tool_call=tool_call,
+        ui_features=(),
+        context=context,
+        sanitize_parameters=mode,
+        hash_key=hash_key,
+    )
+
+    event = audit_logger.events[0]
+    assert isinstance(event, ToolInvocationEvent)
+    assert event.parameters == {"message": "hi", "password": expected}
+    assert event.parameters_sanitized is (mode != SanitizeMode.NONE)
+    assert tool_call.arguments["password"] == "hunter2"
@@ -3,7 +3,7 @@ Tests for tool access control and permissions.
 """
 
 import pytest
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Type, TypeVar, Union
 
 from vanna.core.tool import (
@@ -129,6 +129,7 @@ async def test_tool_access_empty_groups_allows_all(regular_user, agent_memory):
 
     assert result.success is True
     assert "Mock tool executed" in result.result_for_llm
+    assert isinstance(result.metadata["execution_time_ms"], int)
 
 
 @pytest.mark.asyncio
@@ -315,6 +316,42 @@ async def test_get_schemas_filters_by_user(admin_user, regular_user):
     assert len(user_tool_names) == 2
 
 
+@pytest.mark.asyncio
+async def test_registered_access_groups_override_tool_groups(admin_user):
+    """Test that access groups passed at registration apply to the schema."""
+    print("\n=== Access Group Override Test ===")
+
+    registry = ToolRegistry()
+    tool = MockTool("admin_tool")
+    registry.register_local_tool(tool, access_groups=["admin"])
+
+    schemas = await registry.get_schemas(admin_user)
+
+    print(f"✓ Schema access groups: {schemas[0].access_groups}")
+    assert schemas[0].access_groups == ["admin"]
+    # The registered tool itself is left untouched
+    assert registry.get_tool("admin_tool") is tool
+    assert tool.access_groups == []
+
+
+@pytest.mark.asyncio
+async def test_lazy_schemas_match_eager_schemas(admin_user, regular_user):
+    """Test that deferred schema generation gives the same schemas."""
+    print("\n=== Lazy Schemas Test ===")
+
+    eager = ToolRegistry()
+    lazy = ToolRegistry(lazy_schemas=True)
+    for registry in (eager, lazy):
+        registry.register_local_tool(MockTool("public_tool"), access_groups=[])
+        registry.register_local_tool(MockTool("admin_tool"), access_groups=["admin"])
+
+    for user in (admin_user, regular_user, None):
+        eager_schemas = await eager.get_schemas(user)
+        lazy_schemas = await lazy.get_schemas(user)
+        print(f"✓ Schemas: {[s.name for s in lazy_schemas]}")
+        assert lazy_schemas == eager_schemas
+
+
 @pytest.mark.asyncio
 async def test_tool_not_found(agent_memory):
     """Test execution of non-existent tool."""
@@ -343,6 +380,72 @@ async def test_tool_not_found(agent_memory):
     assert "not found" in result.result_for_llm.lower()
 
 
+@pytest.mark.asyncio
+async def test_invalid_arguments(regular_user, agent_memory):
+    """Test that argument validation errors are reported per field."""
+    print("\n=== Invalid Arguments Test ===")
+
+    registry = ToolRegistry()
+    registry.register_local_tool(MockTool("public_tool"), access_groups=[])
+
+    context = ToolContext(
+        user=regular_user,
+        conversation_id="test_conv",
+        request_id="test_req",
+        agent_memory=agent_memory,
+    )
+
+    tool_call = ToolCall(id="call_1", name="public_tool", arguments={})
+    result = await registry.execute(tool_call, context)
+
+    print(f"✓ Invalid arguments rejected")
+    print(f"  Error: {result.error}")
+
+    assert result.success is False
+    assert result.error == "Invalid arguments: message: Field required"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("access_groups", [[], ["user"]])
+async def test_unexpected_validator_error(
+    regular_user, agent_memory, access_groups, caplog
+):
+    """Test that validator bugs are logged and reported as execution failures."""
+    print("\n=== Unexpected Validator Error Test ===")
+
+    class StrictArgs(BaseModel):
+        message: str = Field(description="A message")
+
+        @field_validator("message")
+        @classmethod
+        def check_message(cls, value: str) -> str:
+            raise TypeError("unsupported message")
+
+    class StrictTool(MockTool):
+        def get_args_schema(self) -> Type[StrictArgs]:  # type: ignore[override]
+            return StrictArgs
+
+    registry = ToolRegistry()
+    registry.register_local_tool(StrictTool("strict_tool"), access_groups=access_groups)
+
+    context = ToolContext(
+        user=regular_user,
+        conversation_id="test_conv",
+        request_id="test_req",
+        agent_memory=agent_memory,
+    )
+
+    tool_call = ToolCall(id="call_1", name="strict_tool", arguments={"message": "x"})
+    result = await registry.execute(tool_call, context)
+
+    print(f"✓ Validator error reported")
+    print(f"  Error: {result.error}")
+
+    assert result.success is False
+    assert result.error == "Execution failed: unsupported message"
+    assert "Argument validation for tool 'strict_tool' failed" in caplog.text
+
+
 @pytest.mark.asyncio
 async def test_duplicate_tool_registration():
     """Test that registering the same tool twice raises error."""
@@ -394,6 +497,146 @@ async def test_tool_access_group_intersection(admin_user, agent_memory):
     assert result.success is True
 
 
+@pytest.mark.asyncio
+async def test_group_membership_changes_are_respected(regular_user, agent_memory):
+    """Test that changing a user's groups updates access on the next call."""
+    print("\n=== Group Membership Change Test ===")
+
+    registry = ToolRegistry()
+    registry.register_local_tool(MockTool("admin_tool"), access_groups=["admin"])
+
+    context = ToolContext(
+        user=regular_user,
+        conversation_id="test_conv",
+        request_id="test_req",
+        agent_memory=agent_memory,
+    )
+    tool_call = ToolCall(id="call_1", name="admin_tool", arguments={"message": "x"})
+
+    result = await registry.execute(tool_call, context)
+    assert result.success is False
+
+    regular_user.group_memberships = ["user", "admin"]
+    result = await registry.execute(tool_call, context)
+    print(f"✓ Access granted after joining admin group")
+    assert result.success is True
+
+    regular_user.group_memberships.remove("admin")
+    result = await registry.execute(tool_call, context)
+    print(f"✓ Access revoked after leaving admin group")
+    assert result.success is False
+
+    regular_user.group_memberships[0] = "admin"
+    result = await registry.execute(tool_call, context)
+    print(f"✓ Access granted after replacing a group in place")
+    assert result.success is True
+
+
+@pytest.mark.asyncio
+async def test_custom_permission_check_is_used(admin_user, agent_memory):
+    """Test that an overridden _validate_tool_permissions is still honored."""
+    print("\n=== Custom Permission Check Test ===")
+
+    class DenyAllRegistry(ToolRegistry):
+        async def _validate_tool_permissions(self, tool, user) -> bool:
+            return False
+
+    registry = DenyAllRegistry()
+    registry.register_local_tool(MockTool("public_tool"), access_groups=[])
+
+    context = ToolContext(
+        user=admin_user,
+        conversation_id="test_conv",
+        request_id="test_req",
+        agent_memory=agent_memory,
+    )
+    tool_call = ToolCall(id="call_1", name="public_tool", arguments={"message": "x"})
+
+    result = await registry.execute(tool_call, context)
+    schemas = await registry.get_schemas(admin_user)
+
+    print(f"✓ Custom check denied access")
+    assert result.success is False
+    assert schemas == []
+
+
+class DenyAccessRegistry(ToolRegistry):
+    """Registry whose synchronous access check denies every call."""
+
+    def _check_access(self, tool_name, user) -> bool:
+        return False
+
+
+class PassThroughRegistry(ToolRegistry):
+    """Registry with a transform_args override that keeps the args."""
+
+    async def transform_args(self, tool, args, user, context):
+        return args
+
+
+class AllowAllRegistry(ToolRegistry):
+    """Registry with an async permission check that allows every call."""
+
+    async def _validate_tool_permissions(self, tool, user) -> bool:
+        return True
+
+
+@pytest.mark.asyncio
+async def test_fast_path_used_for_unrestricted_tool(regular_user, agent_memory):
+    """Test that an unrestricted tool on a plain registry uses the fast path."""
+    print("\n=== Fast Path Used Test ===")
+
+    registry = ToolRegistry()
+    registry.register_local_tool(MockTool("public_tool"), access_groups=[])
+
+    context = ToolContext(
+        user=regular_user,
+        conversation_id="test_conv",
+        request_id="test_req",
+        agent_memory=agent_memory,
+    )
+    tool_call = ToolCall(id="call_1", name="public_tool", arguments={"message": "x"})
+    result = await registry.execute(tool_call, context)
+
+    print(f"✓ Fast path registered and executed")
+    assert "public_tool" in registry._fast_paths
+    assert result.success is True
+    assert isinstance(result.metadata["execution_time_ms"], int)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "registry_class, access_groups, expected_success",
+    [
+        (ToolRegistry, ["user"], True),
+        (PassThroughRegistry, [], True),
+        (AllowAllRegistry, [], True),
+        (DenyAccessRegistry, [], False),
+    ],
+)
+async def test_fast_path_skipped(
+    regular_user, agent_memory, registry_class, access_groups, expected_success
+):
+    """Test that access groups or registry overrides disable the fast path."""
+    print("\n=== Fast Path Skipped Test ===")
+
+    registry = registry_class()
+    registry.register_local_tool(MockTool("some_tool"), access_groups=access_groups)
+
+    context = ToolContext(
+        user=regular_user,
+        conversation_id="test_conv",
+        request_id="test_req",
+        agent_memory=agent_memory,
+    )
+    tool_call = ToolCall(id="call_1", name="some_tool", arguments={"message": "x"})
+    result = await registry.execute(tool_call, context)
+
+    print(f"✓ {registry_class.__name__} with groups {access_groups} used full path")
+    assert "some_tool" not in registry._fast_paths
+    assert result.success is expected_success
+
+
 @pytest.mark.asyncio
 async def test_list_tools():
     """Test listing all registered tools."""
@@ -405,7 +648,7 @@ async def test_list_tools():
     registry.register_local_tool(MockTool("tool2"), access_groups=["admin"])
     registry.register_local_tool(MockTool("tool3"), access_groups=["user"])
 
-    tools = await registry.list_tools()
+    tools = registry.list_tools()
 
     print(f"✓ Listed {len(tools)} tools")
     print(f"  Tools: {tools}")